@@ -89,6 +89,27 @@ def get_excel_styles() -> Tuple[Any, Any, Any, Any]:
     
     return header_fill, thin_border, center_aligned, openpyxl
 
+def register_named_style(wb: Any, name: str, **style_kwargs: Any) -> str:
+    """
+    在工作簿中注册命名样式（已存在则跳过），返回样式名
+    
+    未指定字体时使用工作簿默认字体 (Calibri 11)，与未设置字体的普通单元格一致
+    
+    参数:
+        wb: 工作簿对象
+        name: 样式名称
+        style_kwargs: NamedStyle 的其他参数，如 font, fill, border, alignment, number_format
+    
+    返回:
+        样式名称，可直接赋值给 cell.style
+    """
+    if name not in wb.named_styles:
+        from copy import copy
+        from openpyxl.styles import NamedStyle, DEFAULT_FONT
+        style_kwargs.setdefault('font', copy(DEFAULT_FONT))
+        wb.add_named_style(NamedStyle(name=name, **style_kwargs))
+    return name
+
 def generate_output_filename(output_dir: str, basename: str, data_type: str) -> str:
     """
     生成带时间戳的输出文件名
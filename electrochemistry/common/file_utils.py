@@ -5,15 +5,19 @@
 import os
 import re
 import logging
-from typing import List, Optional, Tuple, Dict, Any
-from pathlib import Path
-import tkinter as tk
-from tkinter import filedialog
+from typing import List, Optional, Tuple, Dict, Any, Callable
+from pathlib import Path, PurePath
 
 logger = logging.getLogger(__name__)
 
+# 识别文件类型时读取的文件头部长度，批量扫描 (scan_data_files) 与各模块的 find_*_files 共用
+HEADER_PEEK_SIZE = 1024
+
 def select_folder() -> str:
     """选择一个文件夹并返回其路径"""
+    # tkinter 仅在需要弹出对话框时才导入
+    import tkinter as tk
+    from tkinter import filedialog
     root = tk.Tk()
     # root.withdraw()  # 隐藏主窗口
     root.withdraw()  # Hide the main window
@@ -28,7 +32,7 @@ def is_cv_file(file_path: str) -> bool:
     """
     try:
         with open(file_path, 'r', errors='ignore') as f:
-            header = f.read(1000)
+            header = f.read(HEADER_PEEK_SIZE)
             is_cv = ('Cyclic Voltammetry' in header or 
                      'CYCLIC VOLTAMMETRY' in header)
             is_not_cv = any(keyword in header for keyword in [
@@ -52,7 +56,7 @@ def is_lsv_file(file_path: str) -> bool:
     """
     try:
         with open(file_path, 'r', errors='ignore') as f:
-            header = f.read(1000)
+            header = f.read(HEADER_PEEK_SIZE)
             is_lsv = ('Linear Sweep Voltammetry' in header or 
                       'LINEAR SWEEP VOLTAMMETRY' in header or
                       'LSV' in header)
@@ -68,7 +72,7 @@ def is_eis_file(file_path: str) -> bool:
     """
     try:
         with open(file_path, 'r', errors='ignore') as f:
-            header = f.read(1000)
+            header = f.read(HEADER_PEEK_SIZE)
             is_eis = ('A.C. Impedance' in header or 
                       'Electrochemical Impedance' in header or
                       'EIS' in header)
@@ -119,6 +123,33 @@ def find_files_by_type(folder_path: str, file_type: str) -> List[str]:
     
     return matching_files
 
+def scan_data_files(folder_path: str, header_checks: Dict[str, Callable[[str], bool]]) -> Dict[str, List[str]]:
+    """
+    单次遍历文件夹，按文件头部内容将 .txt 文件归入各数据类型
+    
+    参数:
+        folder_path: 包含数据文件的文件夹路径
+        header_checks: {类型名: 文件头识别函数}，识别函数接收文件头部文本，返回是否属于该类型
+    
+    返回:
+        {类型名: 文件路径列表}
+    """
+    file_lists: Dict[str, List[str]] = {name: [] for name in header_checks}
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if not (entry.name.lower().endswith('.txt') and entry.is_file()):
+                continue
+            try:
+                with open(entry.path, 'r', errors='ignore') as f:
+                    header = f.read(HEADER_PEEK_SIZE)
+            except OSError as e:
+                logger.warning(f"检查文件 {entry.path} 时出错: {e}")
+                continue
+            for name, is_header in header_checks.items():
+                if is_header(header):
+                    file_lists[name].append(entry.path)
+    return file_lists
+
 def ensure_output_dir(folder_path: str) -> Tuple[str, str]:
     """
     确保输出目录存在，返回输出目录和基础文件名
@@ -129,7 +160,7 @@ def ensure_output_dir(folder_path: str) -> Tuple[str, str]:
     返回:
         (输出目录路径, 基础文件名)
     """
-    folder_basename = os.path.basename(folder_path.rstrip("\\/"))
+    folder_basename = PurePath(folder_path).name
     output_dir = os.path.join(folder_path, "processed_data")
     
     if not os.path.exists(output_dir):
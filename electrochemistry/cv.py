@@ -5,7 +5,7 @@ import re
 import os
 import numpy as np
 from typing import Tuple, List, Optional, Dict, Any
-from pathlib import Path
+from pathlib import Path, PurePath
 import logging
 from datetime import datetime
 import sys
@@ -71,6 +71,32 @@ try:
 except ImportError:
     OPENPYXL_AVAILABLE = False
 
+def is_cv_header(header: str) -> bool:
+    """
+    根据文件头部内容判断是否为循环伏安法(CV)数据文件
+    通过查找关键词（如'Cyclic Voltammetry'）判断
+    """
+    # # 明确匹配CV关键词
+    # 明确匹配CV关键词
+    is_cv = ('Cyclic Voltammetry' in header or 
+             'CYCLIC VOLTAMMETRY' in header)
+    
+    # # 排除非CV文件类型
+    # 排除非CV文件类型
+    is_not_cv = any(keyword in header for keyword in [
+        'Linear Sweep Voltammetry', 
+        'A.C. Impedance',
+        'LSV',
+        'Chronoamperometry',
+        'Open Circuit',
+        'EIS',
+        'Tafel'
+    ])
+    
+    # # 只有确认是CV且不包含非CV关键词的文件才返回True
+    # 只有确认是CV且不包含非CV关键词的文件才返回True
+    return is_cv and not is_not_cv
+
 def is_cv_file(file_path: str) -> bool:
     """
     检查文件是否为循环伏安法(CV)数据文件
@@ -80,28 +106,7 @@ def is_cv_file(file_path: str) -> bool:
         with open(file_path, 'r', errors='ignore') as f:
             # # 只读取文件头部内容用于检测（提高性能）
             # 只读取文件头部内容用于检测（提高性能）
-            header = f.read(1000)
-            
-            # # 明确匹配CV关键词
-            # 明确匹配CV关键词
-            is_cv = ('Cyclic Voltammetry' in header or 
-                     'CYCLIC VOLTAMMETRY' in header)
-            
-            # # 排除非CV文件类型
-            # 排除非CV文件类型
-            is_not_cv = any(keyword in header for keyword in [
-                'Linear Sweep Voltammetry', 
-                'A.C. Impedance',
-                'LSV',
-                'Chronoamperometry',
-                'Open Circuit',
-                'EIS',
-                'Tafel'
-            ])
-            
-            # # 只有确认是CV且不包含非CV关键词的文件才返回True
-            # 只有确认是CV且不包含非CV关键词的文件才返回True
-            return is_cv and not is_not_cv
+            return is_cv_header(f.read(file_utils.HEADER_PEEK_SIZE))
     except Exception as e:
         logger.warning(f"检查文件{file_path}时出错: {str(e)}")
         return False
@@ -934,7 +939,7 @@ def main():
         logger.info(f"  {os.path.basename(file_path)}")
     
     # 输出文件路径
-    folder_basename = os.path.basename(folder_path.rstrip("\\/"))
+    folder_basename = PurePath(folder_path).name
     # 新建 processed_data 文件夹（如果不存在）
     output_dir = os.path.join(folder_path, "processed_data")
     if not os.path.exists(output_dir):
@@ -541,6 +541,10 @@ def process_eis_files(file_paths: List[str], output_file: str, folder_basename:
 # 它现在返回 Tuple[Workbook, List[Dict[str, Any]]]
 process_all_files_from_paths = process_eis_files
 
+def is_eis_header(header: str) -> bool:
+    """根据文件头部内容判断是否为EIS数据文件（包含 "A.C. Impedance"）"""
+    return "A.C. Impedance" in header
+
 def find_eis_files(folder_path: str) -> List[str]:
     """
     在指定文件夹中查找所有可能的EIS数据文件
@@ -564,8 +568,7 @@ def find_eis_files(folder_path: str) -> List[str]:
     for file_path in file_iterator:
         try:
             with open(file_path, 'r', errors='ignore') as f:
-                header_content = f.read(1024)
-                if "A.C. Impedance" in header_content:
+                if is_eis_header(f.read(file_utils.HEADER_PEEK_SIZE)):
                     eis_files_list.append(file_path)
                     logger.info(f"文件 {os.path.basename(file_path)} 被识别为EIS数据文件。")
         except Exception as e:
@@ -1,12 +1,15 @@
 """
 线性扫描伏安法(LSV)数据处理模块
 """
+import io
 import os
 import sys
+import locale
 import numpy as np
 import logging
 import re
-from typing import Tuple, List, Optional, Any
+import functools
+from typing import Tuple, List, Optional, NamedTuple
 from datetime import datetime
 
 try:
@@ -17,6 +20,8 @@ except ImportError:
     print("提示: 安装tqdm包可以显示进度条。可以运行: pip install tqdm")
 
 # 检测是否在 GUI 环境中运行（如 PyInstaller 打包后的应用）
+# 运行环境在进程生命周期内不会改变，结果只需计算一次
+@functools.lru_cache(maxsize=1)
 def is_gui_mode():
     """判断是否在无控制台的GUI环境中运行"""
     # 检查是否通过 PyInstaller 打包
@@ -60,6 +65,22 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# 兜底表头检测：电位(V)与电流(A)出现在同一行，两者顺序不限
+_HEADER_LINE_RE = re.compile(r'potential.*v.*current.*a|current.*a.*potential.*v', re.IGNORECASE)
+
+# 标准数据表头，文件以二进制读取，按字节查找
+_DATA_HEADER = b'Potential/V, Current/A'
+# 与文本模式open()默认使用的编码保持一致
+_TEXT_ENCODING = locale.getpreferredencoding(False)
+
+
+class LSVRow(NamedTuple):
+    """单个LSV文件的分析结果，过电位单位为mV (分析报告按此顺序解包)"""
+    file_id: str
+    op_10: float
+    op_100: float
+    op_200: float
+
 def extract_lsv_data(filename: str) -> Tuple[List[float], List[float], Optional[str]]:
     """
     从LSV数据文件中提取电位和电流数据
@@ -71,8 +92,12 @@ def extract_lsv_data(filename: str) -> Tuple[List[float], List[float], Optional[
         (电位列表, 电流列表, 文件标识)
     """
     try:
-        with open(filename, 'r', errors='ignore') as f:
-            content = f.read()
+        with open(filename, 'rb') as f:
+            raw = f.read()
+        
+        # 文件信息都位于数据表头之前，找到表头时只解码这一段前缀
+        header_pos = raw.find(_DATA_HEADER)
+        content = (raw[:header_pos] if header_pos >= 0 else raw).decode(_TEXT_ENCODING, errors='ignore')
         
         # 提取文件标识符（例如"File: lsv4"中的"lsv4"）
         file_id = None
@@ -84,20 +109,26 @@ def extract_lsv_data(filename: str) -> Tuple[List[float], List[float], Optional[
             base_name = os.path.basename(filename)
             file_id = os.path.splitext(base_name)[0]
         
-        # 提取电位和电流数据
-        potentials = []
-        currents = []
-        
         # 查找数据部分
-        if 'Potential/V, Current/A' in content:
-            data_section = content.split('Potential/V, Current/A')[1].strip()
+        if header_pos >= 0:
+            data_start = header_pos + len(_DATA_HEADER)
+            data_end = raw.find(_DATA_HEADER, data_start)
+            data_bytes = raw[data_start:data_end] if data_end >= 0 else raw[data_start:]
+            # 标准的逗号分隔数据直接交给NumPy解析，无需逐行创建字符串
+            if data_bytes.strip():
+                try:
+                    data = np.loadtxt(io.BytesIO(data_bytes), delimiter=',', usecols=(0, 1), ndmin=2)
+                    return data[:, 0].tolist(), data[:, 1].tolist(), file_id
+                except ValueError:
+                    # 含有其他分隔符或非数值行时，退回逐行解析
+                    pass
+            data_section = data_bytes.decode(_TEXT_ENCODING, errors='ignore').strip()
         elif 'Potential' in content and 'Current' in content:
             # 尝试找到数据部分的开始
-            lines = content.strip().split('\n')
+            lines = content.strip().splitlines()
             data_start = -1
             for i, line in enumerate(lines):
-                if ('Potential' in line and 'Current' in line) or \
-                   (re.search(r'[Pp]otential.*[Vv]', line) and re.search(r'[Cc]urrent.*[Aa]', line)):
+                if ('Potential' in line and 'Current' in line) or _HEADER_LINE_RE.search(line):
                     data_start = i + 1
                     break
             
@@ -114,11 +145,12 @@ def extract_lsv_data(filename: str) -> Tuple[List[float], List[float], Optional[
             logger.warning(f"在文件{filename}中未找到电位和电流数据")
             return [], [], file_id
         
-        lines = data_section.strip().split('\n')
+        lines = data_section.splitlines()
         
-        # 预分配数组提高性能
-        potentials = []
-        currents = []
+        # 预分配数组提高性能（按行数分配，最后截去未使用的部分）
+        potentials = [0.0] * len(lines)
+        currents = [0.0] * len(lines)
+        n = 0
         
         for line in lines:
             if line.strip():
@@ -134,10 +166,14 @@ def extract_lsv_data(filename: str) -> Tuple[List[float], List[float], Optional[
                     try:
                         potential = float(parts[0].strip())
                         current = float(parts[1].strip())
-                        potentials.append(potential)
-                        currents.append(current)
                     except (ValueError, IndexError):
                         continue
+                    potentials[n] = potential
+                    currents[n] = current
+                    n += 1
+        
+        del potentials[n:]
+        del currents[n:]
         
         return potentials, currents, file_id
     
@@ -145,30 +181,29 @@ def extract_lsv_data(filename: str) -> Tuple[List[float], List[float], Optional[
         logger.error(f"处理文件{filename}时出错: {str(e)}")
         return [], [], None
 
-def find_closest_values(values: List[float], targets: List[float]) -> List[int]:
+# 分析所需的电流密度目标值 (mA·cm⁻²)
+_OVERPOTENTIAL_TARGETS = np.array([10.0, 100.0, 200.0])
+
+def _process_lsv(potentials: List[float], currents: List[float]) -> Tuple[List[float], List[float], List[float]]:
     """
-    找到数组中最接近目标值的元素索引
+    应用电位/电流转换，并在同一次向量化处理中找出各目标电流密度处的电位
     
     参数:
-        values: 要搜索的数组
-        targets: 目标值列表
+        potentials: 原始电位列表 (V)
+        currents: 原始电流列表 (A)
         
     返回:
-        最接近目标值的索引列表
+        (转换后的电位列表, 转换后的电流列表, 10/100/200 mA·cm⁻²处的电位列表)
     """
-    if not values or not targets:
-        return []
-        
-    result_indices = []
-    values_array = np.array(values)
-    
-    for target in targets:
-        idx = np.argmin(np.abs(values_array - target))
-        result_indices.append(idx)
-    
-    return result_indices
+    # 应用转换：电位+0.903，电流*-1000
+    processed_potentials = np.asarray(potentials, dtype=np.float64) + 0.903
+    processed_currents = np.asarray(currents, dtype=np.float64) * -1000
+    # 一次广播比较即可得到三个目标值各自最接近的索引
+    closest_indices = np.abs(processed_currents[:, None] - _OVERPOTENTIAL_TARGETS).argmin(axis=0)
+    return (processed_potentials.tolist(), processed_currents.tolist(),
+            processed_potentials[closest_indices].tolist())
 
-def process_lsv_files(file_paths: List[str], output_file: str = None, cv_data_exists: bool = False, wb=None) -> Tuple[Optional[openpyxl.Workbook], Optional[List[Any]], Optional[List[str]]]: # MODIFIED return type
+def process_lsv_files(file_paths: List[str], output_file: str = None, cv_data_exists: bool = False, wb=None) -> Tuple[Optional[openpyxl.Workbook], Optional[List[LSVRow]], Optional[List[str]]]: # MODIFIED return type
     """
     处理LSV文件并准备Excel数据
     
@@ -179,7 +214,7 @@ def process_lsv_files(file_paths: List[str], output_file: str = None, cv_data_ex
         wb: 可选，现有的工作簿对象
         
     返回:
-        (工作簿对象, 分析数据列表, 创建/使用的工作表名称列表)
+        (工作簿对象, 分析数据列表 (LSVRow), 创建/使用的工作表名称列表)
     """
     # 提取并处理所有数据
     all_data = []
@@ -196,11 +231,7 @@ def process_lsv_files(file_paths: List[str], output_file: str = None, cv_data_ex
                 logger.warning(f"文件 {file_path} 中未找到有效数据，跳过")
                 continue
                 
-            # 应用转换：电位+0.903，电流*-1000
-            processed_potentials = [p + 0.903 for p in potentials]
-            processed_currents = [c * -1000 for c in currents]
-            
-            all_data.append((processed_potentials, processed_currents))
+            all_data.append(_process_lsv(potentials, currents))
             file_ids.append(file_id)
             
             logger.info(f"文件 {file_path}: 已处理 {len(potentials)} 个数据点")
@@ -214,7 +245,7 @@ def process_lsv_files(file_paths: List[str], output_file: str = None, cv_data_ex
         return None, None, None # MODIFIED return
     
     # 查找最大数据点数量
-    max_length = max([len(potentials) for potentials, _ in all_data]) if all_data else 0
+    max_length = max([len(potentials) for potentials, _, _ in all_data]) if all_data else 0
     
     created_sheet_names = [] # ADDED: To store created/used sheet names
 
@@ -245,7 +276,7 @@ def process_lsv_files(file_paths: List[str], output_file: str = None, cv_data_ex
     bold_font = excel_utils.get_bold_font() # 使用工具函数
 
     current_col_lsv = 1 # 跟踪LSV数据的列
-    all_analysis_data = [] # 用于存储 (file_id, op_at_10, op_at_100, op_at_200)
+    all_analysis_data = [] # 用于存储 LSVRow(file_id, op_10, op_100, op_200)
     
     # 为每个LSV文件创建标题和数据
     for idx, file_id in enumerate(file_ids):
@@ -281,8 +312,7 @@ def process_lsv_files(file_paths: List[str], output_file: str = None, cv_data_ex
             cell.border = thin_border
             cell.alignment = center_aligned
         
-        potentials, currents = all_data[idx]
-        # highlight_indices = find_closest_values(currents, [10, 100]) # 用于LSV数据高亮 - 已移除
+        potentials, currents, target_potentials = all_data[idx]
 
         for row_idx_offset, (potential, current) in enumerate(zip(potentials, currents)):
             actual_row = row_idx_offset + 5 # 数据从第5行开始
@@ -309,35 +339,9 @@ def process_lsv_files(file_paths: List[str], output_file: str = None, cv_data_ex
             ws.cell(row=actual_row, column=current_col_lsv + 1).border = thin_border
 
         # --- 计算并存储分析数据 ---
-        op_at_10_val = "N/A"
-        op_at_100_val = "N/A"
-        op_at_200_val = "N/A" # 新增：200 mA/cm²时的过电位
-        if currents: # 确保有数据可处理
-            # 查找10, 100, 和 200 mA/cm²时的电位
-            closest_indices_for_analysis = find_closest_values(currents, [10.0, 100.0, 200.0])
-            
-            if len(closest_indices_for_analysis) >= 1: # 检查是否至少找到一个值
-                try:
-                    p_at_10 = potentials[closest_indices_for_analysis[0]]
-                    op_at_10_val = (p_at_10 - 1.23) * 1000 # 转换为mV
-                except (IndexError, TypeError): # 为安全起见添加了TypeError
-                    logger.warning(f"文件 {file_id}: 无法找到10 mA·cm⁻²时的电位。")
-            
-            if len(closest_indices_for_analysis) >= 2:
-                try:
-                    p_at_100 = potentials[closest_indices_for_analysis[1]]
-                    op_at_100_val = (p_at_100 - 1.23) * 1000 # 转换为mV
-                except (IndexError, TypeError):
-                    logger.warning(f"文件 {file_id}: 无法找到100 mA·cm⁻²时的电位。")
-
-            if len(closest_indices_for_analysis) >= 3: # 新增：用于200 mA/cm²
-                try:
-                    p_at_200 = potentials[closest_indices_for_analysis[2]]
-                    op_at_200_val = (p_at_200 - 1.23) * 1000 # 转换为mV
-                except (IndexError, TypeError):
-                    logger.warning(f"文件 {file_id}: 无法找到200 mA·cm⁻²时的电位。")
-                    
-        all_analysis_data.append((file_id, op_at_10_val, op_at_100_val, op_at_200_val))
+        # 10, 100, 和 200 mA/cm²时的电位已在转换时一并求出，此处换算为过电位
+        op_at_10_val, op_at_100_val, op_at_200_val = [(p - 1.23) * 1000 for p in target_potentials] # 转换为mV
+        all_analysis_data.append(LSVRow(file_id, op_at_10_val, op_at_100_val, op_at_200_val))
 
         # 更新下一个LSV文件块的起始列
         current_col_lsv += 2
@@ -394,6 +398,9 @@ def process_lsv_files(file_paths: List[str], output_file: str = None, cv_data_ex
             cell.alignment = center_aligned
 
         # 写入分析数据 (从第5行开始)
+        # 对齐样式在循环外创建一次，各行共享
+        left_aligned = Alignment(horizontal='left')
+        right_aligned = Alignment(horizontal='right')
         for row_idx_offset, (file_id_an, op_10, op_100, op_200) in enumerate(all_analysis_data): # 解包 op_200
             actual_row_an = row_idx_offset + 5
             
@@ -407,25 +414,23 @@ def process_lsv_files(file_paths: List[str], output_file: str = None, cv_data_ex
                 cell_an = ws.cell(row=actual_row_an, column=analysis_section_start_col + c_offset_an)
                 cell_an.border = thin_border
                 if c_offset_an == 0: # 文件ID
-                    # 直接创建Alignment对象
-                    cell_an.alignment = openpyxl_module.styles.Alignment(horizontal='left') 
+                    cell_an.alignment = left_aligned
                 else: # 过电位值
-                    # 直接创建Alignment对象
-                    cell_an.alignment = openpyxl_module.styles.Alignment(horizontal='right') 
+                    cell_an.alignment = right_aligned
             
             # 过电位的数字格式
             if isinstance(op_10, float):
                 cell_op_10.number_format = '0.0' # mV格式，例如1位小数
             else: # 对于 "N/A"
-                 cell_op_10.alignment = Alignment(horizontal='center')
+                 cell_op_10.alignment = center_aligned
             if isinstance(op_100, float):
                 cell_op_100.number_format = '0.0' # mV格式
             else: # 对于 "N/A"
-                 cell_op_100.alignment = Alignment(horizontal='center')
+                 cell_op_100.alignment = center_aligned
             if isinstance(op_200, float): # op_200的新格式
                 cell_op_200.number_format = '0.0' 
             else: # 对于 "N/A"
-                 cell_op_200.alignment = Alignment(horizontal='center')
+                 cell_op_200.alignment = center_aligned
         
         final_content_end_col = analysis_section_start_col + 3 # 调整以适应新列
     else:
@@ -463,7 +468,7 @@ def process_lsv_files(file_paths: List[str], output_file: str = None, cv_data_ex
             
     return wb, all_analysis_data, created_sheet_names # MODIFIED return
 
-def process_all_files_from_paths(file_paths: List[str], output_file: str, folder_basename: str, wb: Optional[openpyxl.Workbook] = None) -> Tuple[Optional[openpyxl.Workbook], Optional[List[Any]], Optional[List[str]]]:
+def process_all_files_from_paths(file_paths: List[str], output_file: str, folder_basename: str, wb: Optional[openpyxl.Workbook] = None) -> Tuple[Optional[openpyxl.Workbook], Optional[List[LSVRow]], Optional[List[str]]]:
     """
     处理来自给定路径列表的所有LSV文件。
     这是从 main.py 调用的包装器。
@@ -481,6 +486,29 @@ def process_all_files_from_paths(file_paths: List[str], output_file: str, folder
     )
     return workbook, analysis_results, sheet_names
 
+def is_lsv_header(header: str) -> bool:
+    """
+    根据文件头部内容判断是否为LSV数据文件
+    """
+    # 匹配LSV关键词
+    is_lsv = ('Linear Sweep Voltammetry' in header or 
+             'LINEAR SWEEP VOLTAMMETRY' in header or
+             'LSV' in header)
+    
+    # 排除非LSV文件类型
+    is_not_lsv = any(keyword in header for keyword in [
+        'Cyclic Voltammetry', 
+        'A.C. Impedance',
+        'CV',
+        'Chronoamperometry',
+        'Open Circuit',
+        'EIS',
+        'Tafel'
+    ])
+    
+    # 只有确认是LSV且不包含非LSV关键词的文件才返回True
+    return is_lsv and not is_not_lsv
+
 def find_lsv_files(folder_path: str) -> List[str]:
     """
     在指定文件夹中查找所有可能的LSV数据文件
@@ -506,26 +534,7 @@ def find_lsv_files(folder_path: str) -> List[str]:
         try:
             with open(file_path, 'r', errors='ignore') as f:
                 # 只读取文件头部内容用于检测（提高性能）
-                header = f.read(1000)
-                
-                # 匹配LSV关键词
-                is_lsv = ('Linear Sweep Voltammetry' in header or 
-                         'LINEAR SWEEP VOLTAMMETRY' in header or
-                         'LSV' in header)
-                
-                # 排除非LSV文件类型
-                is_not_lsv = any(keyword in header for keyword in [
-                    'Cyclic Voltammetry', 
-                    'A.C. Impedance',
-                    'CV',
-                    'Chronoamperometry',
-                    'Open Circuit',
-                    'EIS',
-                    'Tafel'
-                ])
-                
-                # 只有确认是LSV且不包含非LSV关键词的文件才返回True
-                if is_lsv and not is_not_lsv:
+                if is_lsv_header(f.read(file_utils.HEADER_PEEK_SIZE)):
                     lsv_files.append(file_path)
                     logger.debug(f"文件 {file_path} 被识别为LSV数据文件")
                 # elif is_lsv and is_not_lsv: # Debugging: Log files that are LSV but also contain other keywords
@@ -4,9 +4,10 @@
 """
 import os
 import sys
+import argparse
+import time
 import traceback
 import logging # 新增导入
-import tkinter as tk # 添加显示进度窗口
 from datetime import datetime # 添加日期时间模块
 
 # 打包为 exe 后，正确获取应用程序目录
@@ -31,9 +32,16 @@ script_dir = get_application_path()
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
+# 进度窗口日志刷新节流：累计到指定行数或距上次刷新超过指定秒数时才刷新窗口
+_LOG_FLUSH_LINES = 50
+_LOG_FLUSH_INTERVAL = 0.05
+
 class ProgressWindow:
     """简单的进度显示窗口，显示程序执行状态"""
     def __init__(self, title="Electrochemical Data Processing Tool"): # 修改默认标题
+        # tkinter 只在真正创建窗口时导入，无界面模式下不加载
+        import tkinter as tk
+        self._tk = tk
         self.root = tk.Tk()
         self.root.title(title)
 
@@ -88,23 +96,67 @@ class ProgressWindow:
                                 font=("Arial", 9, "italic"))
         status_label.pack(fill="x", pady=(10, 0)) # 调整状态标签上边距
         
+        # 待写入文本框的日志行及上次刷新时间，见 log()/flush()
+        self._pending = []
+        self._last_update = 0.0
+
         self.root.update()
     
     def log(self, message):
-        """添加日志消息到窗口"""
-        self.text.insert("end", message + "\n")
-        self.text.see("end")  # 自动滚动到底部
+        """添加日志消息到窗口（先缓存，按 _LOG_FLUSH_LINES/_LOG_FLUSH_INTERVAL 批量刷新）"""
+        self._pending.append(message)
+        if (len(self._pending) >= _LOG_FLUSH_LINES
+                or time.monotonic() - self._last_update >= _LOG_FLUSH_INTERVAL):
+            self.flush()
+
+    def flush(self):
+        """把缓存的日志一次写入文本框并刷新窗口"""
+        if self._pending:
+            self.text.insert("end", "\n".join(self._pending) + "\n")
+            self._pending.clear()
+            self.text.see("end")  # 自动滚动到底部
         self.root.update()
+        self._last_update = time.monotonic()
     
     def set_status(self, message):
         """设置状态栏消息"""
         self.status_var.set(message)
-        self.root.update()
+        self.flush()
     
     def destroy(self):
         """销毁窗口"""
         self.root.destroy()
 
+    def wait_for_close(self):
+        """添加关闭按钮并进入事件循环，等待用户关闭窗口"""
+        close_button = self._tk.Button(self.root, text="关闭程序", 
+                                       command=self.root.destroy,
+                                       bg=self.button_color_pink, 
+                                       fg=self.button_text_color,
+                                       font=("Arial", 10, "bold"),
+                                       relief="raised", padx=10, pady=5)
+        close_button.pack(pady=(10, 15)) # 调整关闭按钮边距
+        self.flush()
+        
+        # 等待用户关闭窗口
+        self.root.mainloop()
+
+class _NullProgressWindow:
+    """无界面模式 (--no-gui) 使用的占位窗口，接口与 ProgressWindow 相同但不做任何事"""
+    root = None
+
+    def log(self, message):
+        pass
+
+    def set_status(self, message):
+        pass
+
+    def destroy(self):
+        pass
+
+    def wait_for_close(self):
+        pass
+
 # 创建自定义日志处理器，将日志输出到进度窗口
 class ProgressWindowHandler(logging.Handler):
     """自定义日志处理器，将日志输出到进度窗口"""
@@ -116,9 +168,31 @@ class ProgressWindowHandler(logging.Handler):
         log_entry = self.format(record)
         self.window.log(log_entry)
 
+def parse_args(argv=None):
+    """解析命令行参数；参数无效时打印错误并以非零状态退出"""
+    parser = argparse.ArgumentParser(description="电化学数据处理工具")
+    parser.add_argument('folder', nargs='?', default=None,
+                        help="数据文件夹路径；不提供时通过图形界面选择")
+    parser.add_argument('--no-gui', action='store_true',
+                        help="不显示进度窗口和文件夹对话框，此时必须提供数据文件夹路径")
+    args = parser.parse_args(argv)
+    if args.no_gui and not args.folder:
+        parser.error("无界面模式 (--no-gui) 需要提供数据文件夹路径，例如: python run_electrochemistry.py --no-gui <文件夹>")
+    if args.folder is not None and not os.path.isdir(args.folder):
+        parser.error(f"数据文件夹不存在或不是文件夹: {args.folder}")
+    return args
+
 def main_entry(): # 从 main 重命名而来
+    # 命令行参数: --no-gui 跳过进度窗口和文件夹对话框，此时需给出数据文件夹路径
+    args = parse_args()
+    no_gui = args.no_gui
+    folder_arg = args.folder
+
     # 创建进度窗口
-    progress_window = ProgressWindow("Electrochemical Data Processing Tool") # 修改实例化时的标题
+    if no_gui:
+        progress_window = _NullProgressWindow()
+    else:
+        progress_window = ProgressWindow("Electrochemical Data Processing Tool") # 修改实例化时的标题
     progress_window.log("应用程序正在启动...")
     progress_window.set_status("正在初始化...")
     
@@ -133,6 +207,8 @@ def main_entry(): # 从 main 重命名而来
     
     # 获取此模块的日志记录器
     logger = logging.getLogger(__name__)
+    # Tafel 扫描的逐列详细日志为 DEBUG 级别，默认不输出（也不进行格式化）
+    logging.getLogger('electrochemistry.tafel').setLevel(logging.INFO)
     
     # 添加进度窗口日志处理器
     window_handler = ProgressWindowHandler(progress_window)
@@ -164,7 +240,7 @@ def main_entry(): # 从 main 重命名而来
             progress_window.set_status("主程序启动中...")
             
             logger.info("run_electrochemistry.py: electrochemistry.main 模块已导入")
-            process_electrochemistry_data()
+            process_electrochemistry_data(folder_arg)
             logger.info("run_electrochemistry.py: process_electrochemistry_data 函数已执行")
             
         except ImportError as e:
@@ -204,17 +280,8 @@ def main_entry(): # 从 main 重命名而来
         progress_window.log("处理完成。")
         progress_window.set_status("已完成！")
         
-        # 添加一个按钮用于关闭程序
-        close_button = tk.Button(progress_window.root, text="关闭程序", 
-                                 command=progress_window.root.destroy,
-                                 bg=progress_window.button_color_pink, 
-                                 fg=progress_window.button_text_color,
-                                 font=("Arial", 10, "bold"),
-                                 relief="raised", padx=10, pady=5)
-        close_button.pack(pady=(10, 15)) # 调整关闭按钮边距
-        
-        # 等待用户关闭窗口
-        progress_window.root.mainloop()
+        # 添加一个按钮用于关闭程序，并等待用户关闭窗口 (无界面模式下直接返回)
+        progress_window.wait_for_close()
 
 if __name__ == "__main__":
     main_entry() # 调用重命名后的 main 函数